@@ -0,0 +1,269 @@
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from torch_tb_profiler import io
+from torch_tb_profiler.io import base, file, utils
+from torch_tb_profiler.io.base import StatData
+from torch_tb_profiler.io.file import File, LocalFileSystem
+
+
+class TestFile(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_file(self, content):
+        path = os.path.join(self.temp_dir, 'test.txt')
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def open_file(self, content, mode='r', chunk_size=None):
+        f = File(self.write_file(content), mode)
+        if chunk_size is not None:
+            f.buff_chunk_size = chunk_size
+        return f
+
+    def test_read_splits_characters(self):
+        # every 'é' is 2 bytes, so reading 1 byte at a time stops in the middle of each of them
+        with self.open_file('aéé€b'.encode('utf-8')) as f:
+            chars = [f.read(1) for _ in range(6)]
+        self.assertEqual(chars, ['a', 'é', 'é', '€', 'b', ''])
+
+    def test_read_across_chunks(self):
+        content = 'héllo wörld €\n' * 100
+        for chunk_size in (1, 2, 3, 7, 100):
+            with self.open_file(content.encode('utf-8'), chunk_size=chunk_size) as f:
+                parts = []
+                while True:
+                    part = f.read(5)
+                    if not part:
+                        break
+                    parts.append(part)
+            self.assertEqual(''.join(parts), content)
+
+    def test_iterate_across_chunks(self):
+        lines = ['héllo\n', '\n', 'wörld €' * 10 + '\n', 'last line without newline €']
+        for mode, expected in (('r', lines), ('rb', [line.encode('utf-8') for line in lines])):
+            for chunk_size in (1, 2, 3, 7, 1000):
+                with self.open_file(''.join(lines).encode('utf-8'), mode, chunk_size) as f:
+                    self.assertEqual(list(f), expected)
+
+    def test_mixed_read_and_next(self):
+        with self.open_file('aé\nbc\nd€'.encode('utf-8'), chunk_size=2) as f:
+            # stops in the middle of 'é', which is completed by the line
+            self.assertEqual(f.read(2), 'a')
+            self.assertEqual(next(f), 'é\n')
+            self.assertEqual(f.read(1), 'b')
+            self.assertEqual(next(f), 'c\n')
+            self.assertEqual(next(f), 'd€')
+            self.assertRaises(StopIteration, next, f)
+            self.assertEqual(f.read(), '')
+
+    def test_read_all(self):
+        content = 'héllo\nwörld'
+        with self.open_file(content.encode('utf-8'), chunk_size=3) as f:
+            self.assertEqual(f.read(4), 'hél')
+            self.assertEqual(f.read(), 'lo\nwörld')
+
+    def test_empty_file(self):
+        for mode, empty in (('r', ''), ('rb', b'')):
+            with self.open_file(b'', mode) as f:
+                self.assertEqual(list(f), [])
+            with self.open_file(b'', mode) as f:
+                self.assertEqual(f.read(), empty)
+                self.assertEqual(f.read(1), empty)
+
+    def test_truncated_character_raises(self):
+        content = b'abc\xe2\x82'
+        with self.open_file(content) as f:
+            self.assertRaises(UnicodeDecodeError, f.read)
+        with self.open_file(content) as f:
+            self.assertEqual(f.read(4), 'abc')
+            self.assertRaises(UnicodeDecodeError, f.read, 4)
+        with self.open_file(content) as f:
+            self.assertRaises(UnicodeDecodeError, list, f)
+        with self.open_file(b'abc\xe2') as f:
+            self.assertEqual(f.read(4), 'abc')
+            self.assertRaises(UnicodeDecodeError, next, f)
+
+
+class TestLocalRead(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'test.bin')
+        with open(self.path, 'wb') as f:
+            f.write(b'0123456789')
+        self.fs = LocalFileSystem()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def read(self, size, offset):
+        return self.fs.read(self.path, binary_mode=True, size=size, continue_from={'opaque_offset': offset})
+
+    def test_read_at_offset(self):
+        self.assertEqual(self.read(4, 3), (b'3456', {'opaque_offset': 7}))
+        # a size past the end stops at the end
+        self.assertEqual(self.read(10, 7), (b'789', {'opaque_offset': 10}))
+
+    def test_read_to_end(self):
+        self.assertEqual(self.fs.read(self.path, binary_mode=True), (b'0123456789', {'opaque_offset': 10}))
+        self.assertEqual(self.read(None, 6), (b'6789', {'opaque_offset': 10}))
+
+    def test_read_nothing(self):
+        self.assertEqual(self.read(0, 4), (b'', {'opaque_offset': 4}))
+
+    def test_read_at_or_past_end(self):
+        for size in (None, 0, 5):
+            self.assertEqual(self.read(size, 10), (b'', {'opaque_offset': 10}))
+            self.assertEqual(self.read(size, 15), (b'', {'opaque_offset': 15}))
+
+    def test_same_as_text_mode_offsets(self):
+        # the offsets of both paths can be mixed when continuing a read
+        with open(self.path, 'rb') as f:
+            f.seek(3)
+            expected = (f.read(4), {'opaque_offset': f.tell()})
+        self.assertEqual(self.read(4, 3), expected)
+
+
+class FakeFileSystem:
+    """Answers with the names of the files, to check how the paths are batched."""
+
+    def __init__(self):
+        self.batches = []
+
+    def read_many(self, filenames, binary_mode=False):
+        self.batches.append(filenames)
+        return [filename.encode('utf-8') for filename in filenames]
+
+    def stat_many(self, filenames):
+        self.batches.append(filenames)
+        return [StatData(len(filename)) for filename in filenames]
+
+
+class TestManyFiles(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.contents = [('file%d' % i).encode('utf-8') * (i + 1) for i in range(20)]
+        self.paths = []
+        for i, content in enumerate(self.contents):
+            path = os.path.join(self.temp_dir, 'file%d' % i)
+            with open(path, 'wb') as f:
+                f.write(content)
+            self.paths.append(path)
+        self.fs = LocalFileSystem()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_keeps_order(self):
+        self.assertEqual(self.fs.read_many(self.paths, True), self.contents)
+        self.assertEqual(self.fs.read_many(self.paths), [content.decode('utf-8') for content in self.contents])
+        self.assertEqual(self.fs.stat_many(self.paths), [StatData(len(content)) for content in self.contents])
+        self.assertEqual(io.read_many(self.paths), self.contents)
+        self.assertEqual(io.stat_many(self.paths), [StatData(len(content)) for content in self.contents])
+
+    def test_mixed_filesystems(self):
+        fake = FakeFileSystem()
+        file.register_filesystem('fake', fake)
+        self.addCleanup(file._REGISTERED_FILESYSTEMS.pop, 'fake')
+        filenames = ['fake://a', self.paths[0], 'fake://b', self.paths[1], 'fake://c']
+
+        self.assertEqual(io.read_many(filenames),
+                         [b'fake://a', self.contents[0], b'fake://b', self.contents[1], b'fake://c'])
+        self.assertEqual(io.stat_many(filenames),
+                         [StatData(8), StatData(len(self.contents[0])), StatData(8),
+                          StatData(len(self.contents[1])), StatData(8)])
+        # one batch per filesystem and call
+        self.assertEqual(fake.batches, [['fake://a', 'fake://b', 'fake://c']] * 2)
+
+    def test_single_and_empty(self):
+        with mock.patch.object(base, 'ThreadPoolExecutor') as executor:
+            self.assertEqual(self.fs.read_many([], True), [])
+            self.assertEqual(self.fs.stat_many([]), [])
+            self.assertEqual(self.fs.read_many(self.paths[:1], True), self.contents[:1])
+            self.assertEqual(self.fs.stat_many(self.paths[:1]), [StatData(len(self.contents[0]))])
+            self.assertEqual(io.read_many([]), [])
+            self.assertEqual(io.stat_many([]), [])
+        executor.assert_not_called()
+
+    def test_max_connections(self):
+        fs = LocalFileSystem()
+        fs.max_workers = 8
+        with mock.patch.object(base, 'ThreadPoolExecutor', wraps=ThreadPoolExecutor) as executor:
+            self.assertEqual(fs.read_many(self.paths[:3], True), self.contents[:3])
+            self.assertEqual(executor.call_args, mock.call(max_workers=3))
+            self.assertEqual(fs.read_many(self.paths, True), self.contents)
+            self.assertEqual(executor.call_args, mock.call(max_workers=8))
+            fs.max_connections = 2
+            self.assertEqual(fs.stat_many(self.paths), [StatData(len(content)) for content in self.contents])
+            self.assertEqual(executor.call_args, mock.call(max_workers=2))
+            # an explicit worker count is capped as well
+            self.assertEqual(fs._map_concurrently(len, self.contents, 16), [len(c) for c in self.contents])
+            self.assertEqual(executor.call_args, mock.call(max_workers=2))
+            fs.max_connections = 1
+            executor.reset_mock()
+            self.assertEqual(fs.read_many(self.paths, True), self.contents)
+            executor.assert_not_called()
+
+
+class FakeListing:
+    def __init__(self, names):
+        self.names = names
+        self.calls = []
+
+    def list_prefix(self, root, prefix, delimiter=None, limit=None):
+        self.calls.append((prefix, delimiter, limit))
+        names = [name for name in self.names if name.startswith(prefix)]
+        if delimiter:
+            names = sorted({prefix + name[len(prefix):].split(delimiter)[0] + delimiter
+                            if delimiter in name[len(prefix):] else name for name in names})
+        return names[:limit]
+
+
+class TestCachedListing(unittest.TestCase):
+    def setUp(self):
+        self.fs = FakeListing(['run/a/1.pt.trace.json', 'run/b.txt'])
+        self.now = 1000.0
+        patcher = mock.patch.object(utils.time, 'monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(utils._list_cache.clear)
+
+    def test_expiry(self):
+        self.assertEqual(utils.cached_listing(self.fs, 'bucket', 'run/'), ('run/a/1.pt.trace.json', 'run/b.txt'))
+        utils.cached_listing(self.fs, 'bucket', 'run/')
+        self.assertEqual(len(self.fs.calls), 1)
+        self.now += utils.LIST_CACHE_TTL
+        self.assertIsNone(utils.peek_listing(self.fs, 'bucket', 'run/'))
+        # the expired entry is dropped instead of being kept next to the new one
+        utils.cached_listing(self.fs, 'bucket', 'run/a/')
+        self.assertEqual(list(utils._list_cache), [(self.fs, 'bucket', ('run/a/',))])
+
+    def test_invalidate(self):
+        utils.cached_listing(self.fs, 'bucket', 'run/')
+        utils.cached_listing(self.fs, 'other', 'run/')
+        utils.invalidate_listing('bucket')
+        self.assertIsNone(utils.peek_listing(self.fs, 'bucket', 'run/'))
+        self.assertIsNotNone(utils.peek_listing(self.fs, 'other', 'run/'))
+        utils.cached_listing(self.fs, 'bucket', 'run/')
+        self.assertEqual(len(self.fs.calls), 3)
+
+    def test_listed_as_dir(self):
+        self.assertIsNone(utils.listed_as_dir(self.fs, 'bucket', 'run/a/'))
+        self.assertEqual(utils.cached_listing(self.fs, 'bucket', 'run/', '/'), ('run/a/', 'run/b.txt'))
+        self.assertTrue(utils.listed_as_dir(self.fs, 'bucket', 'run/a/'))
+        self.assertFalse(utils.listed_as_dir(self.fs, 'bucket', 'run/b.txt/'))
+        self.assertFalse(utils.listed_as_dir(self.fs, 'bucket', 'run/c/'))
+        self.assertEqual(len(self.fs.calls), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 from .cache import Cache
 from .file import (BaseFileSystem, StatData, abspath, basename, download_file,
                    exists, get_filesystem, glob, isdir, join, listdir,
-                   makedirs, read, register_filesystem, relpath, walk)
+                   makedirs, read, read_many, register_filesystem, relpath,
+                   stat_many, walk)
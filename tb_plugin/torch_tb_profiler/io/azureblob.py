@@ -1,13 +1,16 @@
 # -------------------------------------------------------------------------
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # -------------------------------------------------------------------------
+import itertools
 import os
 
 from azure.storage.blob import ContainerClient
+from requests.adapters import DEFAULT_POOLSIZE
 
 from .. import utils
 from .base import BaseFileSystem, RemotePath, StatData
-from .utils import as_bytes, as_text, parse_blob_url
+from .utils import (as_bytes, as_text, cached_listing, invalidate_listing,
+                    listed_as_dir, parse_blob_url)
 
 logger = utils.get_logger()
 
@@ -15,10 +18,40 @@ logger = utils.get_logger()
 class AzureBlobSystem(RemotePath, BaseFileSystem):
     """Provides filesystem access to S3."""
 
+    # The default RequestsTransport of azure-core keeps DEFAULT_POOLSIZE connections per ContainerClient,
+    # any thread above that would open and drop a connection for every request.
+    max_workers = DEFAULT_POOLSIZE
+    max_connections = DEFAULT_POOLSIZE
+
     def __init__(self):
         if not ContainerClient:
             raise ImportError('azure-storage-blob must be installed for Azure Blob support.')
         self.connection_string = os.environ.get('AZURE_STORAGE_CONNECTION_STRING', None)
+        self._reset_container_clients()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset_container_clients)
+
+    def __getstate__(self):
+        """The container clients cannot be pickled, so they are created again in the new process
+        (see Cache.__getstate__).
+        """
+        data = self.__dict__.copy()
+        del data['_container_clients']
+        return data
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset_container_clients()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset_container_clients)
+
+    def _reset_container_clients(self):
+        # ContainerClient per (account, container), so that the HTTP pipeline and its connections are reused.
+        # Also called in forked children, which must not share the connections of the parent's sessions.
+        self._container_clients = {}
+
+    def support_prefetch(self):
+        return True
 
     def exists(self, dirname):
         """Returns whether the path is a directory or not."""
@@ -64,6 +97,7 @@ class AzureBlobSystem(RemotePath, BaseFileSystem):
         else:
             file_content = as_bytes(file_content)
         client.upload_blob(path, file_content)
+        invalidate_listing((account, container))
 
     def download_file(self, file_to_download, file_to_save):
         logger.info('azure blob: starting downloading file %s as %s' % (file_to_download, file_to_save))
@@ -73,12 +107,12 @@ class AzureBlobSystem(RemotePath, BaseFileSystem):
         if not blob_client.exists():
             raise FileNotFoundError("file %s doesn't exist!" % path)
 
-        downloader = blob_client.download_blob()
+        # Fetch the ranges concurrently and write them straight to the file instead of into memory first.
+        downloader = blob_client.download_blob(max_concurrency=self.max_connections, read_timeout=60)
         with open(file_to_save, 'wb') as downloaded_file:
-            data = downloader.readall()
-            downloaded_file.write(data)
+            size = downloader.readinto(downloaded_file)
             logger.info('azure blob: file %s is downloaded as %s, size is %d' %
-                        (file_to_download, file_to_save, len(data)))
+                        (file_to_download, file_to_save, size))
 
     def glob(self, filename):
         """Returns a list of files that match the given pattern(s)."""
@@ -95,32 +129,35 @@ class AzureBlobSystem(RemotePath, BaseFileSystem):
         filename = filename[:-1]
 
         account, container, path = self.container_and_path(filename)
-        client = self.create_container_client(account, container)
-        blobs = client.list_blobs(name_starts_with=path)
-        return [blob.name for blob in blobs]
+        return list(cached_listing(self, (account, container), path))
 
     def isdir(self, dirname):
         """Returns whether the path is a directory or not."""
-        basename, parts = self.split_blob_path(dirname)
-        if basename is None or parts is None:
-            return False
-        if basename == '':
+        account, container, path = self.container_and_path(dirname)
+        if not path:
             # root container case
             return True
-        else:
-            return basename == parts[0] and len(parts) > 1
+        if not path.endswith('/'):
+            path += '/'
+        # answered by the listing of the parent directory when listdir just listed it
+        is_dir = listed_as_dir(self, (account, container), path)
+        if is_dir is not None:
+            return is_dir
+        return len(cached_listing(self, (account, container), path, '/', 1)) > 0
 
     def listdir(self, dirname):
         """Returns a list of entries contained within a directory."""
         account, container, path = self.container_and_path(dirname)
-        client = self.create_container_client(account, container)
-        blob_iter = client.list_blobs(name_starts_with=path)
-        items = []
-        for blob in blob_iter:
-            item = self.relpath(blob.name, path)
-            if items not in items:
-                items.append(item)
-        return items
+        if path and not path.endswith('/'):
+            path += '/'
+        # The delimited listing only returns the direct children, the sub directories end with '/'.
+        # A blob may share its name with a sub directory, the dict deduplicates them and keeps the order.
+        items = {}
+        for name in cached_listing(self, (account, container), path, '/'):
+            item = name[len(path):].rstrip('/')
+            if item:
+                items.setdefault(item, None)
+        return list(items)
 
     def makedirs(self, dirname):
         """No need create directory since the upload blob will automatically create"""
@@ -159,19 +196,34 @@ class AzureBlobSystem(RemotePath, BaseFileSystem):
             * If the blob_path is test1/test2/test.txt, return (test.txt, [test.txt])
         """
         account, container, path = self.container_and_path(blob_path)
-        client = self.create_container_client(account, container)
-        blobs = client.list_blobs(name_starts_with=path, maxresults=1)
+        names = cached_listing(self, (account, container), path, None, 1)
 
-        for blob in blobs:
+        for name in names:
             dir_path, basename = self.split(path)
             if dir_path:
-                rel_path = blob.name[len(dir_path):]
+                rel_path = name[len(dir_path):]
                 parts = rel_path.lstrip('/').split('/')
             else:
-                parts = blob.name.split('/')
+                parts = name.split('/')
             return (basename, parts)
         return (None, None)
 
+    def list_prefix(self, root, prefix, delimiter=None, limit=None):
+        """Returns the names of the blobs starting with `prefix`, at most `limit` of them if given.
+        With a delimiter, the blobs under a sub directory are grouped into a single name ending with it.
+        Use `cached_listing` rather than calling this directly.
+        """
+        client = self.create_container_client(*root)
+        # 5000 is the largest page size the blob service accepts
+        results_per_page = 5000 if limit is None else limit
+        if delimiter:
+            blobs = client.walk_blobs(name_starts_with=prefix, delimiter=delimiter, results_per_page=results_per_page)
+        else:
+            blobs = client.list_blobs(name_starts_with=prefix, results_per_page=results_per_page)
+        if limit is not None:
+            blobs = itertools.islice(blobs, limit)
+        return [blob.name for blob in blobs]
+
     def container_and_path(self, url):
         """Split an Azure blob -prefixed URL into container and blob path."""
         root, parts = parse_blob_url(url)
@@ -180,8 +232,18 @@ class AzureBlobSystem(RemotePath, BaseFileSystem):
         return root, parts[0], parts[1]
 
     def create_container_client(self, account, container):
-        if self.connection_string:
-            client = ContainerClient.from_connection_string(self.connection_string, container)
-        else:
-            client = ContainerClient.from_container_url('https://{}/{}'.format(account, container))
+        key = (account, container)
+        client = self._container_clients.get(key)
+        if client is None:
+            # Download large blobs in 16MB requests instead of the 32MB/4MB defaults for the first/next ones.
+            options = {
+                'max_single_get_size': 16 * 1024 * 1024,
+                'max_chunk_get_size': 16 * 1024 * 1024,
+                'connection_timeout': 30,
+            }
+            if self.connection_string:
+                client = ContainerClient.from_connection_string(self.connection_string, container, **options)
+            else:
+                client = ContainerClient.from_container_url('https://{}/{}'.format(account, container), **options)
+            self._container_clients[key] = client
         return client
@@ -4,15 +4,27 @@
 import os
 from abc import ABC, abstractmethod
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
 # Data returned from the Stat call.
 StatData = namedtuple('StatData', ['length'])
 
 
 class BaseFileSystem(ABC):
+    # Number of threads used by read_many and stat_many, 1 issues the calls one after the other.
+    max_workers = 1
+    # Size of the connection pool shared by those threads, None if the filesystem doesn't use one.
+    max_connections = None
+
     def support_append(self):
         return False
 
+    def support_prefetch(self):
+        """Whether File should read the next chunk in the background while the current one is consumed.
+        Only worth it for remote filesystems where every read is a network round-trip.
+        """
+        return False
+
     def append(self, filename, file_content, binary_mode=False):
         pass
 
@@ -51,6 +63,27 @@ class BaseFileSystem(ABC):
     def stat(self, filename):
         raise NotImplementedError
 
+    def read_many(self, filenames, binary_mode=False):
+        """Reads the whole contents of several files, returned in the same order as `filenames`."""
+        return self._map_concurrently(lambda filename: self.read(filename, binary_mode)[0], filenames)
+
+    def stat_many(self, filenames):
+        """Returns the file statistics of several paths, in the same order as `filenames`."""
+        return self._map_concurrently(self.stat, filenames)
+
+    def _map_concurrently(self, fn, items, max_workers=None):
+        """Returns `[fn(item) for item in items]`, computed by up to `max_workers` threads
+        (`self.max_workers` by default) and never more than `self.max_connections`.
+        """
+        items = list(items)
+        workers = min(len(items), max_workers or self.max_workers)
+        if self.max_connections is not None:
+            workers = min(workers, self.max_connections)
+        if workers <= 1:
+            return [fn(item) for item in items]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(fn, items))
+
 
 class BasePath(ABC):
     @abstractmethod
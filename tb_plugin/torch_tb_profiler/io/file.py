@@ -13,19 +13,27 @@ The following functionalities are added after forking:
 * add global wrapper for abspath, basename, join, download_file.
 * change the global walk wrapper to support specialized walk.
 """
+import codecs
 import glob as py_glob
+import io as sysio
+import itertools
 import os
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from .. import utils
 from .base import BaseFileSystem, LocalPath, RemotePath, StatData
-from .utils import as_bytes, as_text, parse_blob_url
+from .utils import (as_bytes, as_text, cached_listing, invalidate_listing,
+                    listed_as_dir, parse_blob_url)
 
 logger = utils.get_logger()
 
 try:
     import boto3
+    import botocore.config
     import botocore.exceptions
+    from boto3.s3.transfer import TransferConfig
 
     S3_ENABLED = True
 except ImportError:
@@ -47,6 +55,28 @@ except ImportError:
 
 _DEFAULT_BLOCK_SIZE = 16 * 1024 * 1024
 
+# Size of the connection pool of the S3 client, which is shared by all its threads.
+_S3_MAX_POOL_CONNECTIONS = 50
+# The recursive listing and the multipart downloads each use up to a third of the pool,
+# read_many and stat_many two thirds, so that a listing can run next to them.
+_S3_POOL_SHARE = _S3_MAX_POOL_CONNECTIONS // 3
+
+# Payloads at or above the threshold are transferred as concurrent multipart
+# requests, smaller ones go through a single put_object/get_object call.
+_S3_MULTIPART_THRESHOLD = 8 * 1024 * 1024
+if S3_ENABLED:
+    _S3_TRANSFER_CONFIG = TransferConfig(
+        multipart_threshold=_S3_MULTIPART_THRESHOLD,
+        multipart_chunksize=_S3_MULTIPART_THRESHOLD,
+        max_concurrency=10,
+        use_threads=True)
+    # Downloads use larger ranges and more workers.
+    _S3_DOWNLOAD_CONFIG = TransferConfig(
+        multipart_threshold=_S3_MULTIPART_THRESHOLD,
+        multipart_chunksize=16 * 1024 * 1024,
+        max_concurrency=_S3_POOL_SHARE,
+        use_threads=True)
+
 # Registry of filesystems by prefix.
 #
 # Currently supports:
@@ -65,24 +95,25 @@ def register_filesystem(prefix, filesystem):
 
 def get_filesystem(filename):
     """Return the registered filesystem for the given file."""
-    prefix = ""
     index = filename.find("://")
-    if index >= 0:
-        prefix = filename[:index]
-    if prefix.upper() in ('HTTP', 'HTTPS'):
+    prefix = filename[:index] if index >= 0 else ""
+    # the registered prefixes are checked first, HTTP(S) URLs are dispatched by host
+    fs = _REGISTERED_FILESYSTEMS.get(prefix)
+    if fs is None and prefix.upper() in ('HTTP', 'HTTPS'):
         root, _ = parse_blob_url(filename)
         if root.lower().endswith('.blob.core.windows.net'):
             fs = _REGISTERED_FILESYSTEMS.get('blob', None)
         else:
             raise ValueError("Not supported file system for prefix %s" % root)
-    else:
-        fs = _REGISTERED_FILESYSTEMS.get(prefix, None)
     if fs is None:
         raise ValueError("No recognized filesystem for prefix %s" % prefix)
     return fs
 
 
 class LocalFileSystem(LocalPath, BaseFileSystem):
+    # read_many overlaps the I/O latency of several files
+    max_workers = 8
+
     def __init__(self):
         pass
 
@@ -90,14 +121,14 @@ class LocalFileSystem(LocalPath, BaseFileSystem):
         return os.path.exists(filename)
 
     def read(self, filename, binary_mode=False, size=None, continue_from=None):
-        mode = "rb" if binary_mode else "r"
-        encoding = None if binary_mode else "utf8"
-        if not self.exists(filename):
-            raise FileNotFoundError(filename)
-
         offset = None
         if continue_from is not None:
             offset = continue_from.get("opaque_offset", None)
+        if binary_mode and hasattr(os, "pread"):
+            return self._pread(filename, size, offset or 0)
+
+        mode = "rb" if binary_mode else "r"
+        encoding = None if binary_mode else "utf8"
         with open(filename, mode, encoding=encoding) as f:
             if offset is not None:
                 f.seek(offset)
@@ -108,6 +139,28 @@ class LocalFileSystem(LocalPath, BaseFileSystem):
             continuation_token = {"opaque_offset": f.tell()}
             return (data, continuation_token)
 
+    def _pread(self, filename, size, offset):
+        """Reads raw bytes with positioned reads, which skips the seek and the copy through
+        BufferedReader. Text mode still goes through `open` for decoding and newline translation.
+        """
+        fd = os.open(filename, os.O_RDONLY)
+        try:
+            if size is None:
+                size = max(os.fstat(fd).st_size - offset, 0)
+            chunks = []
+            while size > 0:
+                # pread may return less than asked for, e.g. Linux caps one call at ~2GB
+                chunk = os.pread(fd, size, offset)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                offset += len(chunk)
+                size -= len(chunk)
+        finally:
+            os.close(fd)
+        data = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+        return (data, {"opaque_offset": offset})
+
     def write(self, filename, file_content, binary_mode=False):
         """Writes string file contents to a file, overwriting any existing contents.
         """
@@ -130,24 +183,16 @@ class LocalFileSystem(LocalPath, BaseFileSystem):
     def glob(self, filename):
         """Returns a list of files that match the given pattern(s)."""
         if isinstance(filename, str):
-            return [
-                matching_filename
-                for matching_filename in py_glob.glob(filename)
-            ]
+            return py_glob.glob(filename)
         else:
-            return [
-                matching_filename
-                for single_filename in filename
-                for matching_filename in py_glob.glob(single_filename)
-            ]
+            return list(itertools.chain.from_iterable(
+                py_glob.iglob(single_filename) for single_filename in filename))
 
     def isdir(self, dirname):
         return os.path.isdir(dirname)
 
     def listdir(self, dirname):
-        entries = os.listdir(dirname)
-        entries = [item for item in entries]
-        return entries
+        return os.listdir(dirname)
 
     def makedirs(self, path):
         os.makedirs(path, exist_ok=True)
@@ -170,6 +215,9 @@ class LocalFileSystem(LocalPath, BaseFileSystem):
 class S3FileSystem(RemotePath, BaseFileSystem):
     """Provides filesystem access to S3."""
 
+    max_workers = 2 * _S3_POOL_SHARE
+    max_connections = _S3_MAX_POOL_CONNECTIONS
+
     def __init__(self):
         if not boto3:
             raise ImportError("boto3 must be installed for S3 support.")
@@ -179,6 +227,48 @@ class S3FileSystem(RemotePath, BaseFileSystem):
         if access_key and secret_key:
             boto3.setup_default_session(
                 aws_access_key_id=access_key, aws_secret_access_key=secret_key)
+        self._reset_client()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset_client)
+
+    def __getstate__(self):
+        """The boto3 client cannot be pickled, so the new process creates its own
+        (see Cache.__getstate__).
+        """
+        data = self.__dict__.copy()
+        del data['_s3_client']
+        del data['_client_lock']
+        return data
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset_client()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset_client)
+
+    def _reset_client(self):
+        # Created on first use, so that importing the plugin doesn't depend on the S3 settings.
+        # Also called in forked children: boto3 clients aren't fork-safe, the parent's threads
+        # keep using its connections and the lock may have been held at the time of the fork.
+        self._s3_client = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def _client(self):
+        # Share one client (and its connection pool) across all calls instead of
+        # building a new botocore session for every request.
+        # Unlike resources, clients are thread-safe, which the *_many methods rely on.
+        if self._s3_client is None:
+            with self._client_lock:
+                if self._s3_client is None:
+                    config = botocore.config.Config(
+                        max_pool_connections=_S3_MAX_POOL_CONNECTIONS,
+                        retries={'max_attempts': 10, 'mode': 'adaptive'})
+                    self._s3_client = boto3.client("s3", endpoint_url=self._s3_endpoint, config=config)
+        return self._s3_client
+
+    def support_prefetch(self):
+        return True
 
     def bucket_and_path(self, url):
         """Split an S3-prefixed URL into bucket and path."""
@@ -191,16 +281,19 @@ class S3FileSystem(RemotePath, BaseFileSystem):
 
     def exists(self, filename):
         """Determines whether a path exists or not."""
-        client = boto3.client("s3", endpoint_url=self._s3_endpoint)
         bucket, path = self.bucket_and_path(filename)
-        r = client.list_objects(Bucket=bucket, Prefix=path, Delimiter="/")
-        if r.get("Contents") or r.get("CommonPrefixes"):
-            return True
-        return False
+        if path and not path.endswith("/"):
+            # An exact key match only costs a HEAD request.
+            try:
+                self._client.head_object(Bucket=bucket, Key=path)
+                return True
+            except botocore.exceptions.ClientError as exc:
+                if exc.response["Error"]["Code"] not in ["404", "NoSuchKey"]:
+                    raise
+        return self._has_children(bucket, path)
 
     def read(self, filename, binary_mode=False, size=None, continue_from=None):
         """Reads contents of a file to a string."""
-        s3 = boto3.resource("s3", endpoint_url=self._s3_endpoint)
         bucket, path = self.bucket_and_path(filename)
         args = {}
 
@@ -218,14 +311,13 @@ class S3FileSystem(RemotePath, BaseFileSystem):
 
         logger.info("s3: starting reading file %s" % filename)
         try:
-            stream = s3.Object(bucket, path).get(**args)["Body"].read()
+            stream = self._client.get_object(Bucket=bucket, Key=path, **args)["Body"].read()
         except botocore.exceptions.ClientError as exc:
             if exc.response["Error"]["Code"] in ["416", "InvalidRange"]:
                 if size is not None:
                     # Asked for too much, so request just to the end. Do this
                     # in a second request so we don't check length in all cases.
-                    client = boto3.client("s3", endpoint_url=self._s3_endpoint)
-                    obj = client.head_object(Bucket=bucket, Key=path)
+                    obj = self._client.head_object(Bucket=bucket, Key=path)
                     content_length = obj["ContentLength"]
                     endpoint = min(content_length, offset + size)
                 if offset == endpoint:
@@ -233,7 +325,7 @@ class S3FileSystem(RemotePath, BaseFileSystem):
                     stream = b""
                 else:
                     args["Range"] = "bytes={}-{}".format(offset, endpoint)
-                    stream = s3.Object(bucket, path).get(**args)["Body"].read()
+                    stream = self._client.get_object(Bucket=bucket, Key=path, **args)["Body"].read()
             else:
                 raise
 
@@ -249,24 +341,29 @@ class S3FileSystem(RemotePath, BaseFileSystem):
 
     def write(self, filename, file_content, binary_mode=False):
         """Writes string file contents to a file."""
-        client = boto3.client("s3", endpoint_url=self._s3_endpoint)
         bucket, path = self.bucket_and_path(filename)
         if binary_mode:
             if not isinstance(file_content, bytes):
                 raise TypeError("File content type must be bytes")
         else:
             file_content = as_bytes(file_content)
-        client.put_object(Body=file_content, Bucket=bucket, Key=path)
+        if len(file_content) < _S3_MULTIPART_THRESHOLD:
+            self._client.put_object(Body=file_content, Bucket=bucket, Key=path)
+        else:
+            self._client.upload_fileobj(sysio.BytesIO(file_content), bucket, path, Config=_S3_TRANSFER_CONFIG)
+        invalidate_listing(bucket)
 
     def download_file(self, file_to_download, file_to_save):
         logger.info("s3: starting downloading file %s as %s" %
                     (file_to_download, file_to_save))
-        # Use boto3.resource instead of boto3.client('s3') to support minio.
+        # The shared client is created with S3_ENDPOINT, so minio is supported as well.
         # https://docs.min.io/docs/how-to-use-aws-sdk-for-python-with-minio-server.html
         # To support minio, the S3_ENDPOINT need to be set like: S3_ENDPOINT=http://localhost:9000
-        s3 = boto3.resource("s3", endpoint_url=self._s3_endpoint)
         bucket, path = self.bucket_and_path(file_to_download)
-        s3.Bucket(bucket).download_file(path, file_to_save)
+        with open(file_to_save, "wb") as downloaded_file:
+            # The byte ranges are fetched in parallel and written at their offsets
+            # in the seekable file, in whatever order they complete.
+            self._client.download_fileobj(bucket, path, downloaded_file, Config=_S3_DOWNLOAD_CONFIG)
         logger.info("s3: file %s is downloaded as %s" % (file_to_download, file_to_save))
         return
 
@@ -281,62 +378,107 @@ class S3FileSystem(RemotePath, BaseFileSystem):
             return []
 
         filename = filename[:-1]
-        client = boto3.client("s3", endpoint_url=self._s3_endpoint)
         bucket, path = self.bucket_and_path(filename)
-        p = client.get_paginator("list_objects")
         keys = []
-        for r in p.paginate(Bucket=bucket, Prefix=path):
-            for o in r.get("Contents", []):
-                key = o["Key"][len(path):]
-                if key:
-                    keys.append(filename + key)
+        for name in cached_listing(self, bucket, path):
+            key = name[len(path):]
+            if key:
+                keys.append(filename + key)
         return keys
 
     def isdir(self, dirname):
         """Returns whether the path is a directory or not."""
-        client = boto3.client("s3", endpoint_url=self._s3_endpoint)
         bucket, path = self.bucket_and_path(dirname)
-        if not path.endswith("/"):
-            path += "/"
-        r = client.list_objects(Bucket=bucket, Prefix=path, Delimiter="/")
-        if r.get("Contents") or r.get("CommonPrefixes"):
-            return True
-        return False
+        return self._has_children(bucket, path)
 
     def listdir(self, dirname):
         """Returns a list of entries contained within a directory."""
-        client = boto3.client("s3", endpoint_url=self._s3_endpoint)
         bucket, path = self.bucket_and_path(dirname)
-        p = client.get_paginator("list_objects")
-        if not path.endswith("/"):
+        if path and not path.endswith("/"):
             path += "/"
         keys = []
-        for r in p.paginate(Bucket=bucket, Prefix=path, Delimiter="/"):
-            keys.extend(
-                o["Prefix"][len(path): -1] for o in r.get("CommonPrefixes", [])
-            )
-            for o in r.get("Contents", []):
-                key = o["Key"][len(path):]
-                if key:
-                    keys.append(key)
+        for name in cached_listing(self, bucket, path, "/"):
+            key = name[len(path):]
+            if key.endswith("/"):
+                # common prefix, i.e. a sub directory
+                keys.append(key[:-1])
+            elif key:
+                keys.append(key)
+        return keys
+
+    def list_prefix(self, bucket, prefix, delimiter=None, limit=None):
+        """Returns the keys and common prefixes starting with `prefix`, at most `limit` of them if given.
+        Use `cached_listing` rather than calling this directly.
+        """
+        if delimiter is None and limit is None:
+            return self._list_recursive_parallel(bucket, prefix)
+
+        args = {"Bucket": bucket, "Prefix": prefix}
+        if delimiter:
+            args["Delimiter"] = delimiter
+        if limit is not None:
+            pages = [self._client.list_objects_v2(MaxKeys=limit, **args)]
+        else:
+            pages = self._list_pages(**args)
+        return [
+            name
+            for r in pages
+            for name in itertools.chain(
+                (o["Prefix"] for o in r.get("CommonPrefixes", [])),
+                (o["Key"] for o in r.get("Contents", [])))
+        ]
+
+    def _list_pages(self, **args):
+        p = self._client.get_paginator("list_objects_v2")
+        return p.paginate(PaginationConfig={"PageSize": 1000}, **args)
+
+    def _list_keys(self, bucket, prefix):
+        return [o["Key"] for r in self._list_pages(Bucket=bucket, Prefix=prefix) for o in r.get("Contents", [])]
+
+    def _list_recursive_parallel(self, bucket, prefix):
+        """Returns every key under `prefix`.
+        S3 pages are at most 1000 keys and each page needs the continuation token of the previous one,
+        so the first level is listed with a delimiter and the sub prefixes found there are paginated
+        concurrently.
+        """
+        keys = []
+        sub_prefixes = []
+        for r in self._list_pages(Bucket=bucket, Prefix=prefix, Delimiter="/"):
+            sub_prefixes.extend(o["Prefix"] for o in r.get("CommonPrefixes", []))
+            keys.extend(o["Key"] for o in r.get("Contents", []))
+        if sub_prefixes:
+            sub_keys = self._map_concurrently(lambda p: self._list_keys(bucket, p), sub_prefixes, _S3_POOL_SHARE)
+            keys.extend(itertools.chain.from_iterable(sub_keys))
+            # keep the lexicographical order returned by S3
+            keys.sort()
         return keys
 
+    def _has_children(self, bucket, path):
+        """Returns whether any key lives under the directory prefix `path`."""
+        if path and not path.endswith("/"):
+            path += "/"
+        if path:
+            # answered by the listing of the parent directory when listdir just listed it
+            is_dir = listed_as_dir(self, bucket, path)
+            if is_dir is not None:
+                return is_dir
+        return len(cached_listing(self, bucket, path, "/", 1)) > 0
+
     def makedirs(self, dirname):
         """Creates a directory and all parent/intermediate directories."""
         if not self.exists(dirname):
-            client = boto3.client("s3", endpoint_url=self._s3_endpoint)
             bucket, path = self.bucket_and_path(dirname)
             if not path.endswith("/"):
                 path += "/"
-            client.put_object(Body="", Bucket=bucket, Key=path)
+            self._client.put_object(Body="", Bucket=bucket, Key=path)
+            invalidate_listing(bucket)
 
     def stat(self, filename):
         """Returns file statistics for a given path."""
         # Size of the file is given by ContentLength from S3
-        client = boto3.client("s3", endpoint_url=self._s3_endpoint)
         bucket, path = self.bucket_and_path(filename)
 
-        obj = client.head_object(Bucket=bucket, Key=path)
+        obj = self._client.head_object(Bucket=bucket, Key=path)
         return StatData(obj["ContentLength"])
 
 
@@ -360,40 +502,63 @@ class File(object):
         self.filename = filename
         self.fs = get_filesystem(self.filename)
         self.fs_supports_append = self.fs.support_append()
-        self.buff = None
+        # BytesIO over the last chunk read from the filesystem. The chunks are always read as bytes,
+        # so lines are split with the C level search for b"\n" and text is only decoded when returned.
+        self.buff_io = None
         self.buff_chunk_size = _DEFAULT_BLOCK_SIZE
-        self.buff_offset = 0
         self.continuation_token = None
+        # (read_size, future) of the chunk being read in the background, see _fill_buffer
+        self.prefetcher = None
+        self.prefetched_chunk = None
         self.write_temp = None
         self.write_started = False
         self.binary_mode = "b" in mode
         self.write_mode = "w" in mode
         self.closed = False
+        # the start of a UTF-8 character when a text mode read stopped in the middle of it
+        self.undecoded = b""
+        if not self.write_mode and self.fs.support_prefetch():
+            self.prefetcher = ThreadPoolExecutor(max_workers=1)
 
     def __enter__(self):
         return self
 
     def __exit__(self, *args):
         self.close()
-        self.buff = None
-        self.buff_offset = 0
+        self.buff_io = None
         self.continuation_token = None
+        self.prefetched_chunk = None
 
     def __iter__(self):
         return self
 
-    def _read_buffer_to_offset(self, new_buff_offset):
-        old_buff_offset = self.buff_offset
-        read_size = min(len(self.buff), new_buff_offset) - old_buff_offset
-        self.buff_offset += read_size
-        return self.buff[old_buff_offset: old_buff_offset + read_size]
+    def _fill_buffer(self, read_size):
+        """Replaces the local buffer with the next chunk of the file.
+        Returns False if the end of the file was reached.
+        """
+        prefetched, self.prefetched_chunk = self.prefetched_chunk, None
+        if prefetched is not None and prefetched[0] == read_size:
+            (data, self.continuation_token) = prefetched[1].result()
+        else:
+            # nothing prefetched, or a different size is asked for and the prefetched chunk is dropped
+            (data, self.continuation_token) = self.fs.read(
+                self.filename, True, read_size, self.continuation_token)
+        self.buff_io = sysio.BytesIO(data)
+
+        # A full chunk means there is likely more to read, so fetch it while this one is consumed.
+        if self.prefetcher is not None and read_size is not None and len(data) >= read_size:
+            future = self.prefetcher.submit(
+                self.fs.read, self.filename, True, read_size, self.continuation_token)
+            self.prefetched_chunk = (read_size, future)
+        return len(data) > 0
 
     def read(self, n=None):
         """Reads contents of file to a string.
 
         Args:
-            n: int, number of bytes or characters to read, otherwise
-                read all the contents of the file
+            n: int, number of bytes to read, otherwise read all the contents
+                of the file. In text mode, a character split by `n` is
+                returned by the next read.
 
         Returns:
             Subset of the contents of the file as a string or bytes.
@@ -401,34 +566,44 @@ class File(object):
         if self.write_mode:
             raise OSError("File not opened in read mode")
 
+        data = self._read_bytes(n)
+        if self.binary_mode:
+            return data
+        # fewer bytes than asked for means the end of the file was reached
+        text = self._decode(data, final=n is None or len(data) < n)
+        while data and not text:
+            # `n` stopped in the middle of the first character, an empty string would look like the end of file
+            data = self._read_bytes(1)
+            text = self._decode(data, final=not data)
+        return text
+
+    def _decode(self, data, final=False):
+        """Decodes the bytes read in text mode, an incomplete character at the end is kept for the next call.
+        At the end of the file (`final`), an incomplete character raises UnicodeDecodeError.
+        """
+        if self.undecoded:
+            data = self.undecoded + data
+        text, consumed = codecs.utf_8_decode(data, "strict", final)
+        self.undecoded = data[consumed:]
+        return text
+
+    def _read_bytes(self, n):
         result = None
-        if self.buff and len(self.buff) > self.buff_offset:
+        if self.buff_io is not None:
             # read from local buffer
+            result = self.buff_io.read(n)
             if n is not None:
-                chunk = self._read_buffer_to_offset(self.buff_offset + n)
-                if len(chunk) == n:
-                    return chunk
-                result = chunk
-                n -= len(chunk)
-            else:
-                # add all local buffer and update offsets
-                result = self._read_buffer_to_offset(len(self.buff))
+                if len(result) == n:
+                    return result
+                n -= len(result)
 
         # read from filesystem
         read_size = max(self.buff_chunk_size, n) if n is not None else None
-        (self.buff, self.continuation_token) = self.fs.read(
-            self.filename, self.binary_mode, read_size, self.continuation_token)
-        self.buff_offset = 0
+        self._fill_buffer(read_size)
 
         # add from filesystem
-        if n is not None:
-            chunk = self._read_buffer_to_offset(n)
-        else:
-            # add all local buffer and update offsets
-            chunk = self._read_buffer_to_offset(len(self.buff))
-        result = result + chunk if result else chunk
-
-        return result
+        chunk = self.buff_io.read(n)
+        return result + chunk if result else chunk
 
     def write(self, file_content):
         """Writes string file contents to file, clearing contents of the file
@@ -458,30 +633,31 @@ class File(object):
             self.write_temp.write(compatify(file_content))
 
     def __next__(self):
-        line = None
-        while True:
-            if not self.buff:
-                # read one unit into the buffer
-                line = self.read(1)
-                if line and (line[-1] == "\n" or not self.buff):
-                    return line
-                if not self.buff:
-                    raise StopIteration()
-            else:
-                index = self.buff.find("\n", self.buff_offset)
-                if index != -1:
-                    # include line until now plus newline
-                    chunk = self.read(index + 1 - self.buff_offset)
-                    line = line + chunk if line else chunk
-                    return line
-
-                # read one unit past end of buffer
-                chunk = self.read(len(self.buff) + 1 - self.buff_offset)
-                line = line + chunk if line else chunk
-                if line and (line[-1] == "\n" or not self.buff):
-                    return line
-                if not self.buff:
-                    raise StopIteration()
+        chunk = self.buff_io.readline() if self.buff_io is not None else None
+        if chunk and chunk.endswith(b"\n"):
+            if self.binary_mode:
+                return chunk
+            # a line never ends in the middle of a character, so it can be decoded on its own
+            return self._decode(chunk) if self.undecoded else chunk.decode("utf8")
+
+        # The line goes on in the next chunks, unless this is the end of the file.
+        # Collect the pieces and join them once, instead of copying the line again for every chunk.
+        parts = [chunk] if chunk else []
+        while self._fill_buffer(self.buff_chunk_size):
+            chunk = self.buff_io.readline()
+            parts.append(chunk)
+            if chunk.endswith(b"\n"):
+                break
+        if not parts:
+            if self.undecoded:
+                # a previous read stopped in a character that the file never completes, this raises
+                self._decode(b"", final=True)
+            raise StopIteration()
+        line = parts[0] if len(parts) == 1 else b"".join(parts)
+        if self.binary_mode:
+            return line
+        # without a newline, the line ends at the end of the file
+        return self._decode(line, final=not line.endswith(b"\n"))
 
     def next(self):
         return self.__next__()
@@ -507,6 +683,10 @@ class File(object):
             self.write_temp.close()
             self.write_temp = None
             self.write_started = False
+        if self.prefetcher is not None:
+            # don't wait for a pending prefetch, its result is not needed anymore
+            self.prefetcher.shutdown(wait=False)
+            self.prefetcher = None
         self.closed = True
 
 
@@ -617,6 +797,32 @@ def stat(filename):
     return get_filesystem(filename).stat(filename)
 
 
+def _group_by_filesystem(filenames):
+    """Returns {filesystem: [index in filenames, ...]} so that each filesystem can batch its own paths."""
+    groups = {}
+    for i, filename in enumerate(filenames):
+        groups.setdefault(get_filesystem(filename), []).append(i)
+    return groups
+
+
+def read_many(filenames):
+    """Reads the binary contents of several files, in the same order as `filenames`."""
+    results = [None] * len(filenames)
+    for fs, indices in _group_by_filesystem(filenames).items():
+        for i, data in zip(indices, fs.read_many([filenames[i] for i in indices], True)):
+            results[i] = data
+    return results
+
+
+def stat_many(filenames):
+    """Returns file statistics for several paths, in the same order as `filenames`."""
+    results = [None] * len(filenames)
+    for fs, indices in _group_by_filesystem(filenames).items():
+        for i, stat_data in zip(indices, fs.stat_many([filenames[i] for i in indices])):
+            results[i] = stat_data
+    return results
+
+
 def read(file):
     with File(file, 'rb') as f:
         return f.read()
@@ -56,12 +56,11 @@ class GoogleBlobSystem(RemotePath, BaseFileSystem):
         bucket_name, path = self.bucket_and_path(dirname)
         client = self.create_google_cloud_client()
         blobs = client.list_blobs(bucket_name, prefix=path)
-        items = []
+        # dict keeps the listing order and deduplicates in O(1)
+        items = {}
         for blob in blobs:
-            item = self.relpath(blob.name, path)
-            if items not in items:
-                items.append(item)
-        return items
+            items.setdefault(self.relpath(blob.name, path), None)
+        return list(items)
 
     def makedirs(self, dirname):
         """No need create directory since the upload blob will automatically create"""
@@ -1,3 +1,20 @@
+import threading
+import time
+from urllib import parse
+
+# Remote listings are cached for at most this many seconds. It is kept below
+# consts.MONITOR_RUN_REFRESH_INTERNAL_IN_SECONDS so that every run scan sees
+# fresh data, the cache serves the calls made within one scan, such as the
+# isdir checks on the entries that listdir just returned.
+LIST_CACHE_TTL = 5
+
+# {(fs, root, args): (expires_at, generation, names)}
+_list_cache = {}
+_list_cache_lock = threading.Lock()
+# Per-root (bucket or container) counters, bumped on writes to drop stale listings.
+_list_generations = {}
+
+
 def as_str_any(value):
     """Converts to `str` as `str(value)`, but use `as_str` for `bytes`.
 
@@ -65,8 +82,57 @@ def as_bytes(bytes_or_text, encoding="utf-8"):
 
 
 def parse_blob_url(url):
-    from urllib import parse
     url_path = parse.urlparse(url)
 
     parts = url_path.path.lstrip('/').split('/', 1)
     return url_path.netloc, tuple(parts)
+
+
+def cached_listing(fs, root, *args):
+    """Returns `fs.list_prefix(root, *args)` as a tuple of names.
+
+    The result is reused for up to LIST_CACHE_TTL seconds, or until
+    `invalidate_listing(root)` is called.
+    """
+    names = peek_listing(fs, root, *args)
+    if names is None:
+        # read the generation first, so that a write during the listing drops its result
+        generation = _list_generations.get(root, 0)
+        names = tuple(fs.list_prefix(root, *args))
+        now = time.monotonic()
+        with _list_cache_lock:
+            # Remove the expired listings, otherwise the ones not asked for again would be kept forever.
+            for key in [key for key, (expires_at, _, _) in _list_cache.items() if expires_at <= now]:
+                del _list_cache[key]
+            _list_cache[(fs, root, args)] = (now + LIST_CACHE_TTL, generation, names)
+    return names
+
+
+def peek_listing(fs, root, *args):
+    """Returns the cached result of `cached_listing(fs, root, *args)`, or None without listing anything."""
+    entry = _list_cache.get((fs, root, args))
+    if entry is None:
+        return None
+    expires_at, generation, names = entry
+    if expires_at <= time.monotonic() or generation != _list_generations.get(root, 0):
+        return None
+    return names
+
+
+def listed_as_dir(fs, root, prefix):
+    """Returns whether the directory `prefix` (ending with '/') appears in the cached delimited
+    listing of its parent, or None if that listing isn't cached.
+    """
+    parent = prefix[:prefix.rstrip('/').rfind('/') + 1]
+    names = peek_listing(fs, root, parent, '/')
+    if names is None:
+        return None
+    return prefix in names
+
+
+def invalidate_listing(root):
+    """Drops the cached listings of the given bucket or container."""
+    with _list_cache_lock:
+        _list_generations[root] = _list_generations.get(root, 0) + 1
+        for key in [key for key in _list_cache if key[1] == root]:
+            del _list_cache[key]